@@ -22,6 +22,7 @@ import glob
 import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 import numpy as np
@@ -41,6 +42,9 @@ except Exception:
     ALSA_CARD = "hw:0,0"
     BUFFER_FRAMES = 4096
 
+# Threads used to read track metadata during a library scan
+SCAN_WORKERS = 8
+
 
 class TrackInfo:
     def __init__(self, track_id: int, path: str):
@@ -164,6 +168,7 @@ class AudioEngine(QObject):
     current playback session.
     """
     pcm_chunk = pyqtSignal(object)  # emits numpy array (always a copy) for visualizer
+    state_changed = pyqtSignal(str)  # new PlaybackState; also on playback end and after the bit-perfect check
 
     def __init__(self, music_dir: str = MUSIC_DIR, alsa_card: str = ALSA_CARD):
         super().__init__()  # QObject init
@@ -241,7 +246,12 @@ class AudioEngine(QObject):
             files.extend(glob.glob(os.path.join(self.music_dir, p)))
             files.extend(glob.glob(os.path.join(self.music_dir, "**", p), recursive=True))
         files = sorted(set(files))
-        self.tracks = [TrackInfo(i, f) for i, f in enumerate(files)]
+        if not files:
+            self.tracks = []
+            return
+        # metadata reads are file I/O bound; overlap them across a few threads
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(files))) as pool:
+            self.tracks = list(pool.map(TrackInfo, range(len(files)), files))
 
     def list_tracks(self) -> List[TrackInfo]:
         return self.tracks
@@ -347,6 +357,7 @@ class AudioEngine(QObject):
                 daemon=True,
             )
             self._playback_thread.start()
+        self.state_changed.emit(PlaybackState.PLAYING)
 
     def pause(self):
         try:
@@ -355,6 +366,7 @@ class AudioEngine(QObject):
                 self._state = PlaybackState.PAUSED
         except Exception:
             pass
+        self.state_changed.emit(PlaybackState.PAUSED)
 
     def resume(self):
         try:
@@ -363,6 +375,7 @@ class AudioEngine(QObject):
                 self._state = PlaybackState.PLAYING
         except Exception:
             pass
+        self.state_changed.emit(PlaybackState.PLAYING)
 
     def stop(self):
         try:
@@ -376,6 +389,7 @@ class AudioEngine(QObject):
         except Exception:
             pass
         print("[audio_engine] stop() requested: stop_event set", flush=True)
+        self.state_changed.emit(PlaybackState.STOPPED)
 
     def seek(self, seconds: float):
         with self._seek_lock:
@@ -501,6 +515,7 @@ class AudioEngine(QObject):
                     with self._lock:
                         self._bitperfect = False
                         self._bitperfect_reason = f"Bit-perfect check failed: {e!r}"
+                self.state_changed.emit(self.state)
 
                 # initial seek if requested
                 with self._seek_lock:
@@ -583,6 +598,7 @@ class AudioEngine(QObject):
             except Exception:
                 pass
 
+            ended_state = None
             with self._lock:
                 if self.current_track and self.current_track.path == path:
                     if not stop_event.is_set():
@@ -592,10 +608,31 @@ class AudioEngine(QObject):
                     # when idle with no current track, clear bit-perfect state
                     self._bitperfect = False
                     self._bitperfect_reason = "Idle"
+                    ended_state = self._state
+            if ended_state is not None:
+                self.state_changed.emit(ended_state)
 
             print("[audio_engine] Playback loop finished", flush=True)
 
     # ---------- status ----------
+    # Single-value accessors for callers polling one field at a time (see
+    # get_position() / get_duration() for the timeline); status() builds
+    # the full snapshot.
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    @property
+    def bitperfect(self) -> bool:
+        with self._lock:
+            return bool(self._bitperfect)
+
+    @property
+    def bitperfect_reason(self) -> str:
+        with self._lock:
+            return self._bitperfect_reason
+
     def status(self) -> dict:
         with self._lock:
             return {
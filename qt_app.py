@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 import sys
 import os
+import hashlib
+from collections import deque
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
     QWidget,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QPushButton,
     QLabel,
     QVBoxLayout,
@@ -17,29 +21,80 @@ from PyQt6.QtWidgets import (
     QComboBox,
     QFileDialog,
     QSlider,
+    QStyle,
+    QStyledItemDelegate,
+)
+from PyQt6.QtCore import (
+    Qt,
+    QTimer,
+    QStandardPaths,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QAbstractItemModel,
+    QModelIndex,
+    pyqtSignal,
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QPixmap, QImage, QAction, QFont
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QAction, QFont, QFontMetrics
 
 # Engine
 from app.audio_engine import AudioEngine, PlaybackState
 
-# Visualizer (if present)
-try:
-    from visualizer_window import VisualizerWindow
-except ImportError:
-    VisualizerWindow = None
+
+# Stylesheets, kept as constants so each string is built once and the
+# same value is reused by every label update.
+_MENUBAR_QSS = """
+QMenuBar {
+    font-size: 16px;
+    padding: 6px 12px;
+    spacing: 20px;
+    background: #0b1220;
+    color: #e6eef6;
+}
+QMenuBar::item {
+    padding: 8px 16px;
+    background: transparent;
+}
+QMenuBar::item:selected {
+    background: #1f2a44;
+}
+QMenu {
+    font-size: 14px;
+}
+"""
+_ART_QSS = "background: #111; border: 1px solid #333;"
+_STYLE_BOLD = "font-weight: bold;"
+_STYLE_MUTED = "color: gray;"
+_STYLE_OK = "color: #22c55e;"
+_STYLE_PAUSED = "color: #facc15;"
+_STYLE_WARN = "color: #f97316;"
+
+# update_status poll interval while playing / otherwise (ms)
+STATUS_POLL_PLAYING_MS = 1000
+STATUS_POLL_IDLE_MS = 2000
+# _update_position interval; only runs while playing (ms)
+POSITION_POLL_MS = 100
+# quiet period before a device combo change is applied to the engine (ms)
+DEVICE_CHANGE_DEBOUNCE_MS = 150
+
+# edge of the square the album art is scaled into (px)
+ART_SIZE = 200
+
+
+@lru_cache(maxsize=4096)
+def _format_whole_seconds(s: int) -> str:
+    m, s = divmod(s, 60)
+    return f"{m}:{s:02d}"
 
 
 def format_seconds(sec: Optional[float]) -> str:
+    # Called several times per position tick; the string for each whole
+    # second is only built once
     if sec is None:
         return "–"
     try:
-        s = int(round(sec))
-        m = s // 60
-        s = s % 60
-        return f"{m}:{s:02d}"
-    except Exception:
+        return _format_whole_seconds(int(round(sec)))
+    except (ValueError, OverflowError, TypeError):
         return "–"
 
 
@@ -48,17 +103,443 @@ class SeekSlider(QSlider):
 
     def mousePressEvent(self, ev):
         if ev.button():
-            x = ev.position().x() if hasattr(ev, "position") else ev.x()
             w = self.width()
             if w > 0:
-                ratio = max(0.0, min(1.0, x / float(w)))
-                val = int(round(self.minimum() + ratio * (self.maximum() - self.minimum())))
+                upside_down = self.invertedAppearance() != (
+                    self.layoutDirection() == Qt.LayoutDirection.RightToLeft
+                )
+                val = QStyle.sliderValueFromPosition(
+                    self.minimum(), self.maximum(), int(ev.position().x()), w, upside_down
+                )
                 self.setValue(val)
                 self.clicked.emit(val)
                 return
         super().mousePressEvent(ev)
 
 
+_LEVEL_FONTS: list = []
+
+
+def level_fonts() -> list:
+    """
+    Shared tree fonts for artist, album and track rows (14pt bold, 12pt bold, 10pt).
+    Built on first use, since QFont needs the QApplication to exist.
+    """
+    if not _LEVEL_FONTS:
+        for size, bold in ((14, True), (12, True), (10, False)):
+            f = QFont()
+            f.setPointSize(size)
+            f.setBold(bold)
+            _LEVEL_FONTS.append(f)
+    return _LEVEL_FONTS
+
+
+class _Folder:
+    """Grouped contents of one library folder, built by LibraryModel.set_tracks()."""
+
+    __slots__ = ("name", "dirs", "items")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.dirs: dict = {}  # subfolder name -> _Folder
+        self.items: list = []  # _Folder or (file name, TrackInfo), in path order
+
+
+class _LibraryNode:
+    """A folder or track row in LibraryModel."""
+
+    __slots__ = ("name", "length", "level", "parent", "row", "track", "folder", "children")
+
+    def __init__(self, name: str, level: int, parent: Optional["_LibraryNode"], row: int):
+        self.name = name
+        self.length = ""
+        self.level = level
+        self.parent = parent
+        self.row = row
+        self.track = None
+        # folders: grouped contents from set_tracks(); children stays None
+        # until the view asks for them through fetchMore()
+        self.folder: Optional[_Folder] = None
+        self.children: Optional[list] = None
+
+
+class LibraryModel(QAbstractItemModel):
+    """
+    Two-column (Name, Length) folder tree over the engine's track list.
+
+    Tracks are grouped by folder once in set_tracks(); row objects for a
+    folder's contents are only created when the view fetches them.
+    UserRole is the track id for files and -1 for folders.
+    """
+
+    HEADERS = ("Name", "Length")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._base: Optional[str] = None
+        self._root = _LibraryNode("", -1, None, 0)
+        self._root.children = []
+
+    def set_tracks(self, tracks, music_dir: str) -> bool:
+        """Load the track list; returns True if the tree was rebuilt rather than updated in place."""
+        base = os.path.abspath(music_dir)
+        prefix = base + os.sep
+        cut = len(prefix)
+
+        # One pass over the tracks: each only needs its folder's item list,
+        # and folder chains are created once per distinct folder. Names
+        # used per track are bound to locals up front.
+        root = _Folder("")
+        folder_items = {"": root.items}
+        lookup = folder_items.get
+        add_folder = self._add_folder
+        relpath = os.path.relpath
+        sep = os.sep
+
+        for t in tracks:
+            p = t.path
+            rel = p[cut:] if p.startswith(prefix) else relpath(p, base)
+            folder, _, name = rel.rpartition(sep)
+            items = lookup(folder)
+            if items is None:
+                items = add_folder(root, folder, folder_items)
+            items.append((name, t))
+
+        # A rescan of the same folder is applied as row inserts/removals, so
+        # expansion, selection and scroll position survive; a new folder
+        # gets a fresh tree.
+        if base == self._base:
+            self._merge(self._root, QModelIndex(), root)
+            return False
+        self.beginResetModel()
+        self._base = base
+        self._root = _LibraryNode("", -1, None, 0)
+        self._root.folder = root
+        self._root.children = self._make_children(self._root)
+        self.endResetModel()
+        return True
+
+    @staticmethod
+    def _add_folder(root: "_Folder", folder: str, folder_items: dict) -> list:
+        node = root
+        path = ""
+        for part in folder.split(os.sep):
+            path = path + os.sep + part if path else part
+            sub = node.dirs.get(part)
+            if sub is None:
+                sub = _Folder(part)
+                node.dirs[part] = sub
+                node.items.append(sub)
+                folder_items[path] = sub.items
+            node = sub
+        return node.items
+
+    def _make_children(self, node: _LibraryNode) -> list:
+        return [self._make_node(node, row, entry) for row, entry in enumerate(node.folder.items)]
+
+    @staticmethod
+    def _make_node(parent: _LibraryNode, row: int, entry) -> _LibraryNode:
+        if isinstance(entry, _Folder):
+            child = _LibraryNode(entry.name, parent.level + 1, parent, row)
+            child.folder = entry
+        else:
+            name, t = entry
+            child = _LibraryNode(name, 2, parent, row)
+            child.track = t
+            child.length = format_seconds(t.duration)
+        return child
+
+    @staticmethod
+    def _node_key(node: _LibraryNode) -> tuple:
+        return (node.folder is not None, node.name)
+
+    @staticmethod
+    def _entry_key(entry) -> tuple:
+        return (True, entry.name) if isinstance(entry, _Folder) else (False, entry[0])
+
+    def _merge(self, node: _LibraryNode, parent: QModelIndex, folder: "_Folder"):
+        """Bring an already-built node in line with its rescanned folder contents."""
+        node.folder = folder
+        children = node.children
+        if children is None:
+            return  # not fetched yet; fetchMore will read the new folder
+        entries = folder.items
+        new_pos = {self._entry_key(e): i for i, e in enumerate(entries)}
+
+        # Rows that still exist, in the same relative order, are kept;
+        # everything else is removed (back to front, in contiguous runs).
+        keep = []
+        last = -1
+        for child in children:
+            pos = new_pos.get(self._node_key(child), -1)
+            if pos > last:
+                keep.append(True)
+                last = pos
+            else:
+                keep.append(False)
+        row = len(children) - 1
+        while row >= 0:
+            if keep[row]:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and not keep[row]:
+                row -= 1
+            self.beginRemoveRows(parent, row + 1, end)
+            del children[row + 1 : end + 1]
+            for r in range(row + 1, len(children)):
+                children[r].row = r
+            self.endRemoveRows()
+
+        # Walk the new entries: update survivors, insert runs of new rows
+        # in front of the next surviving row.
+        changed_first = changed_last = -1
+        row = 0
+        while row < len(entries):
+            if row < len(children):
+                child = children[row]
+                end = new_pos[self._node_key(child)]
+            else:
+                end = len(entries)
+            if end > row:
+                self.beginInsertRows(parent, row, end - 1)
+                children[row:row] = [self._make_node(node, r, entries[r]) for r in range(row, end)]
+                for r in range(end, len(children)):
+                    children[r].row = r
+                self.endInsertRows()
+                row = end
+                continue
+            entry = entries[row]
+            if child.folder is not None:
+                self._merge(child, self.createIndex(row, 0, child), entry)
+            else:
+                t = entry[1]
+                length = format_seconds(t.duration)
+                if child.track.id != t.id or child.length != length:
+                    if changed_first < 0:
+                        changed_first = row
+                    changed_last = row
+                child.track = t
+                child.length = length
+            row += 1
+
+        if changed_first >= 0:
+            self.dataChanged.emit(
+                self.createIndex(changed_first, 0, children[changed_first]),
+                self.createIndex(changed_last, 1, children[changed_last]),
+            )
+
+    def _node(self, index: QModelIndex) -> _LibraryNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    # ----- structure -----
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        children = self._node(parent).children
+        if not children or not (0 <= row < len(children)) or not (0 <= column < 2):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        p = index.internalPointer().parent
+        if p is None or p is self._root:
+            return QModelIndex()
+        return self.createIndex(p.row, 0, p)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return len(children) if children else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node.children is not None:
+            return len(node.children) > 0
+        return node.folder is not None and bool(node.folder.items)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.folder is not None and node.children is None
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._node(parent)
+        if node.folder is None or node.children is not None:
+            return
+        children = self._make_children(node)
+        if not children:
+            node.children = children
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.children = children
+        self.endInsertRows()
+
+    # ----- data -----
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name if index.column() == 0 else node.length
+        if role == Qt.ItemDataRole.FontRole:
+            return level_fonts()[min(node.level, 2)]
+        if role == Qt.ItemDataRole.UserRole:
+            return node.track.id if node.track is not None else -1
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
+class UniformRowDelegate(QStyledItemDelegate):
+    """Reports one fixed row height so the tree can use uniformRowHeights."""
+
+    def __init__(self, row_height: int, parent=None):
+        super().__init__(parent)
+        self._row_height = row_height
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        size.setHeight(self._row_height)
+        return size
+
+
+def art_digest(data: bytes) -> str:
+    # Keyed on the embedded bytes rather than the track: tracks of one
+    # album usually carry the same picture, and a retagged file gets a
+    # fresh entry automatically.
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def art_cache_file(cache_dir: Optional[str], digest: str) -> Optional[str]:
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{digest}_{ART_SIZE}.png")
+
+
+class _ArtSignals(QObject):
+    ready = pyqtSignal(str, QImage)  # art digest, scaled art
+
+
+class ArtWorker(QRunnable):
+    """
+    Produces the scaled album art for one embedded image off the GUI thread:
+    loads it from the disk cache, or decodes + smooth-scales it and writes
+    the cache. Only QImage is used here; the QPixmap conversion happens on
+    the GUI thread.
+    """
+
+    def __init__(self, digest: str, data: bytes, cache_dir: Optional[str]):
+        super().__init__()
+        self.digest = digest
+        self.data = data
+        self.cache_dir = cache_dir
+        self.signals = _ArtSignals()
+
+    def run(self):
+        img = QImage()
+        cache_file = art_cache_file(self.cache_dir, self.digest)
+        if cache_file and os.path.exists(cache_file):
+            img.load(cache_file)
+        if img.isNull():
+            src = QImage.fromData(self.data)
+            if not src.isNull():
+                img = src.scaled(
+                    ART_SIZE,
+                    ART_SIZE,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                if cache_file and not img.save(cache_file, "PNG"):
+                    print("Could not write album art cache:", cache_file)
+        self.signals.ready.emit(self.digest, img)
+
+
+class ArtCache(QObject):
+    """
+    Scaled album art for the now-playing panel.
+
+    Pixmaps live in QPixmapCache and as PNGs under `cache_dir`, both keyed
+    by art_digest() of the embedded image; request() builds missing ones on
+    the global thread pool and reports them through `ready`.
+    """
+
+    ready = pyqtSignal(str, QPixmap)  # art digest, scaled art
+
+    def __init__(self, cache_dir: Optional[str], parent=None):
+        super().__init__(parent)
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                print("Album art cache disabled:", e)
+                cache_dir = None
+        self._cache_dir = cache_dir
+        self._jobs: dict = {}  # in-flight ArtWorkers keyed by digest
+
+    def find(self, digest: str) -> Optional[QPixmap]:
+        return QPixmapCache.find(f"art/{digest}")
+
+    def on_disk(self, digest: str) -> bool:
+        """True if the scaled art is in the disk cache already."""
+        cache_file = art_cache_file(self._cache_dir, digest)
+        return cache_file is not None and os.path.exists(cache_file)
+
+    def request(self, digest: str, data: bytes):
+        if digest in self._jobs:
+            return
+        worker = ArtWorker(digest, data, self._cache_dir)
+        worker.signals.ready.connect(self._on_worker_ready)
+        self._jobs[digest] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_worker_ready(self, digest: str, img: QImage):
+        self._jobs.pop(digest, None)
+        if img.isNull():
+            return
+        key = f"art/{digest}"
+        pix = QPixmapCache.find(key)
+        if pix is None:
+            pix = QPixmap.fromImage(img)
+            QPixmapCache.insert(key, pix)
+        self.ready.emit(digest, pix)
+
+
+class _RescanSignals(QObject):
+    finished = pyqtSignal(int)  # number of tracks found
+    error = pyqtSignal(str)
+
+
+class RescanWorker(QRunnable):
+    """
+    Runs a library scan on the global thread pool. With `music_dir` set the
+    engine is switched to that folder (which rescans and persists it).
+    """
+
+    def __init__(self, engine: AudioEngine, music_dir: Optional[str] = None):
+        super().__init__()
+        self.engine = engine
+        self.music_dir = music_dir
+        self.signals = _RescanSignals()
+
+    def run(self):
+        try:
+            if self.music_dir:
+                self.engine.set_music_dir(self.music_dir)
+            else:
+                self.engine._scan_library()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(len(self.engine.list_tracks()))
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -72,23 +553,74 @@ class MainWindow(QMainWindow):
         # Seeking state
         self._seeking = False
         self._seek_preview_seconds: Optional[float] = None
-
-        # Optional visualizer window
-        self.visualizer: Optional["VisualizerWindow"] = None
+        self._drag_duration: float = 0.0
+
+        # Last (text, style) written to each status label by _set_label
+        self._last_status: dict = {}
+        # Engine values update_status last rendered; equal values mean a no-op tick
+        self._last_status_sig: Optional[tuple] = None
+
+        # Track whose metadata/art is currently shown
+        self._prev_track = None
+
+        # Digest of the album art that should be on screen
+        self._art_key: Optional[str] = None
+
+        # Scaled album art shared through Qt's LRU pixmap cache (KiB) and
+        # persisted across sessions
+        QPixmapCache.setCacheLimit(20480)
+        self.art_cache = ArtCache(
+            os.path.join(
+                QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation),
+                "rasputin",
+                "art",
+            ),
+            self,
+        )
+
+        # Track list shown in the tree and its path -> position map, for
+        # Prev/Next; both are refreshed by _load_tracks_tree()
+        self._tracks: list = []
+        self._track_index: dict = {}
+
+        # track id of the selected tree item (None for folders / no selection)
+        self._selected_track_id: Optional[int] = None
+
+        # Last loaded library folder / ALSA device ids, to skip no-op reloads
+        self._last_music_dir: str = os.path.abspath(self.engine.music_dir)
+        self._last_devices_sig: Optional[tuple] = None
+
+        # In-flight library rescan (kept referenced until it reports back)
+        self._rescan_worker: Optional[RescanWorker] = None
+
+        # Optional visualizer window (VisualizerWindow), created on first use
+        self.visualizer: Optional[QWidget] = None
+
+        # PCM chunks for the visualizer, appended straight from the playback
+        # thread (deque.append is thread-safe) and drained once per
+        # visualizer frame instead of one queued signal per chunk
+        self._pcm_ring: deque = deque(maxlen=8)
+        self._pcm_timer = QTimer(self)
+        self._pcm_timer.timeout.connect(self._feed_visualizer)
 
         # Widgets
-        self.tree = QTreeWidget()
-        self.tree.setColumnCount(2)
-        self.tree.setHeaderLabels(["Name", "Length"])
+        self.library_model = LibraryModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.library_model)
         self.tree.setColumnWidth(0, 450)
+        # Rows keep their per-level fonts but share the height of the
+        # largest one, so Qt can skip measuring every row.
+        row_height = QFontMetrics(level_fonts()[0]).height() + 6
+        self.tree.setItemDelegate(UniformRowDelegate(row_height, self.tree))
+        self.tree.setUniformRowHeights(True)
 
         self.now_playing_label = QLabel("Now Playing: –")
         self.state_label = QLabel("State: Idle")
         self.bitperfect_label = QLabel("Bit-perfect: Unknown")
 
         self.art_label = QLabel()
-        self.art_label.setFixedSize(200, 200)
-        self.art_label.setStyleSheet("background: #111; border: 1px solid #333;")
+        self.art_label.setFixedSize(ART_SIZE, ART_SIZE)
+        self.art_label.setStyleSheet(_ART_QSS)
         self.art_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.meta_title = QLabel("Title: –")
@@ -116,6 +648,12 @@ class MainWindow(QMainWindow):
 
         self.visualizer_button = QPushButton("Visualizer")
 
+        # Scrolling through the combo only applies the device it settles on
+        self._device_timer = QTimer(self)
+        self._device_timer.setSingleShot(True)
+        self._device_timer.setInterval(DEVICE_CHANGE_DEBOUNCE_MS)
+        self._device_timer.timeout.connect(self._apply_device_change)
+
         self._create_menu_bar()
         self._setup_ui()
         self._connect_signals()
@@ -125,32 +663,19 @@ class MainWindow(QMainWindow):
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_status)
-        self.timer.start(500)
+        self.timer.start(STATUS_POLL_IDLE_MS)
+
+        # Slider / elapsed time tick, separate from the heavier status refresh
+        self._pos_timer = QTimer(self)
+        self._pos_timer.setInterval(POSITION_POLL_MS)
+        self._pos_timer.timeout.connect(self._update_position)
 
     # ---------------- menu / UI setup ----------------
 
     def _create_menu_bar(self):
         menubar = self.menuBar()
 
-        menubar.setStyleSheet("""
-            QMenuBar {
-                font-size: 16px;
-                padding: 6px 12px;
-                spacing: 20px;
-                background: #0b1220;
-                color: #e6eef6;
-            }
-            QMenuBar::item {
-                padding: 8px 16px;
-                background: transparent;
-            }
-            QMenuBar::item:selected {
-                background: #1f2a44;
-            }
-            QMenu {
-                font-size: 14px;
-            }
-        """)
+        menubar.setStyleSheet(_MENUBAR_QSS)
 
         file_menu = menubar.addMenu("&File")
 
@@ -159,10 +684,10 @@ class MainWindow(QMainWindow):
         import_action.triggered.connect(self.on_import_folder)
         file_menu.addAction(import_action)
 
-        rescan_action = QAction("Rescan library", self)
-        rescan_action.setShortcut("Ctrl+R")
-        rescan_action.triggered.connect(self.on_rescan)
-        file_menu.addAction(rescan_action)
+        self.rescan_action = QAction("Rescan library", self)
+        self.rescan_action.setShortcut("Ctrl+R")
+        self.rescan_action.triggered.connect(self.on_rescan)
+        file_menu.addAction(self.rescan_action)
 
         file_menu.addSeparator()
         quit_action = QAction("Quit", self)
@@ -186,12 +711,12 @@ class MainWindow(QMainWindow):
         right_layout = QVBoxLayout()
         right_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
-        self.now_playing_label.setStyleSheet("font-weight: bold;")
+        self.now_playing_label.setStyleSheet(_STYLE_BOLD)
         right_layout.addWidget(self.now_playing_label)
-        self.state_label.setStyleSheet("color: gray;")
+        self._set_label(self.state_label, self.state_label.text(), _STYLE_MUTED)
         right_layout.addWidget(self.state_label)
 
-        self.bitperfect_label.setStyleSheet("color: #f97316;")
+        self._set_label(self.bitperfect_label, self.bitperfect_label.text(), _STYLE_WARN)
         right_layout.addWidget(self.bitperfect_label)
 
         right_layout.addWidget(self.art_label)
@@ -225,7 +750,8 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(right_layout, 1)
 
     def _connect_signals(self):
-        self.tree.itemDoubleClicked.connect(self.on_tree_double_click)
+        self.tree.doubleClicked.connect(self.on_tree_double_click)
+        self.tree.selectionModel().currentChanged.connect(self._on_tree_selection_changed)
 
         self.play_button.clicked.connect(self.on_play_clicked)
         self.pause_button.clicked.connect(self.on_pause_clicked)
@@ -243,98 +769,56 @@ class MainWindow(QMainWindow):
 
         self.visualizer_button.clicked.connect(self.on_visualizer_clicked)
 
-    # ---------------- tree + devices ----------------
+        # React to play/pause/stop/end-of-track right away instead of
+        # waiting for the (slow, when not playing) poll
+        self.engine.state_changed.connect(self.update_status)
+        self.art_cache.ready.connect(self._on_art_ready)
 
-    def style_tree_item(self, item: QTreeWidgetItem, level: int):
-        f = QFont()
-        if level == 0:
-            f.setPointSize(14)
-            f.setBold(True)
-        elif level == 1:
-            f.setPointSize(12)
-            f.setBold(True)
-        else:
-            f.setPointSize(10)
-            f.setBold(False)
-        item.setFont(0, f)
-        item.setFont(1, f)
+    # ---------------- tree + devices ----------------
 
     def _load_tracks_tree(self):
-        self.tree.clear()
         tracks = self.engine.list_tracks()
-        if not tracks:
-            return
-
-        root_map = {}
-        base = os.path.abspath(self.engine.music_dir)
-
-        for t in tracks:
-            try:
-                rel = os.path.relpath(t.path, base)
-            except Exception:
-                rel = t.path
-            parts = rel.split(os.sep)
-
-            parent = None
-            path_acc = base
-            for i, part in enumerate(parts[:-1]):
-                path_acc = os.path.join(path_acc, part)
-                if path_acc not in root_map:
-                    node = QTreeWidgetItem([part, ""])
-                    node.setData(0, Qt.ItemDataRole.UserRole, {"type": "dir", "path": path_acc})
-                    root_map[path_acc] = node
-                    if parent is None:
-                        self.tree.addTopLevelItem(node)
-                        self.style_tree_item(node, level=0)
-                    else:
-                        parent.addChild(node)
-                        depth = len(parts[:i+1]) - 1
-                        self.style_tree_item(node, level=depth if depth >= 0 else 1)
-                    parent = node
-                else:
-                    parent = root_map[path_acc]
-
-            name = parts[-1]
-            length = format_seconds(t.duration)
-            file_item = QTreeWidgetItem([name, length])
-            file_item.setData(
-                0,
-                Qt.ItemDataRole.UserRole,
-                {"type": "file", "track_id": t.id, "path": t.path},
-            )
-            self.style_tree_item(file_item, level=2)
-            if parent is None:
-                self.tree.addTopLevelItem(file_item)
-            else:
-                parent.addChild(file_item)
-
-        for i in range(self.tree.topLevelItemCount()):
-            self.tree.topLevelItem(i).setExpanded(True)
+        self._tracks = tracks
+        self._track_index = {t.path: i for i, t in enumerate(tracks)}
+        if self.library_model.set_tracks(tracks, self.engine.music_dir):
+            self.tree.expandToDepth(0)
+        # Neither a reset nor renumbered ids emit currentChanged
+        self._on_tree_selection_changed(self.tree.currentIndex(), QModelIndex())
 
     def _load_devices(self):
-        self.device_combo.clear()
         try:
             devs = self.engine.list_alsa_devices()
         except Exception as e:
             print("Error listing ALSA devices:", e)
             devs = []
 
-        if not devs:
-            self.device_combo.addItem("No ALSA devices found", userData=None)
-            self.device_combo.setEnabled(False)
+        # Repopulating the combo is only needed when the device set changed
+        sig = tuple(d["id"] for d in devs)
+        if sig == self._last_devices_sig:
             return
+        self._last_devices_sig = sig
 
-        preferred_index = -1
-        for i, d in enumerate(devs):
-            label = d.get("name", d["id"])
-            self.device_combo.addItem(label, userData=d["id"])
-            if d["id"] == getattr(self.engine, "alsa_card", None):
-                preferred_index = i
-
-        if preferred_index >= 0:
-            self.device_combo.setCurrentIndex(preferred_index)
-        else:
-            self.device_combo.setCurrentIndex(0)
+        # Filling the combo must not go through on_device_changed
+        self.device_combo.blockSignals(True)
+        try:
+            self.device_combo.clear()
+            if not devs:
+                self.device_combo.addItem("No ALSA devices found", userData=None)
+                self.device_combo.setEnabled(False)
+                return
+            self.device_combo.setEnabled(True)
+
+            preferred_index = -1
+            for i, d in enumerate(devs):
+                label = d.get("name", d["id"])
+                self.device_combo.addItem(label, userData=d["id"])
+                if d["id"] == getattr(self.engine, "alsa_card", None):
+                    preferred_index = i
+            self.device_combo.setCurrentIndex(max(preferred_index, 0))
+        finally:
+            self.device_combo.blockSignals(False)
+
+        if preferred_index < 0:
             sel = self.device_combo.currentData()
             if sel:
                 self.engine.set_output_device(sel)
@@ -342,53 +826,87 @@ class MainWindow(QMainWindow):
     # ---------------- menu actions ----------------
 
     def on_import_folder(self):
-        initial = self.engine.status().get("music_dir") or os.path.expanduser("~")
+        if self._rescan_worker is not None:
+            return
+        initial = self.engine.music_dir or os.path.expanduser("~")
         folder = QFileDialog.getExistingDirectory(self, "Select primary music folder", initial)
         if not folder:
             return
-        self.engine.set_music_dir(folder)
-        self._load_tracks_tree()
+        folder = os.path.abspath(folder)
+        if folder == self._last_music_dir:
+            return
+        self._last_music_dir = folder
+        self._start_scan(folder)
         self._load_devices()
-        self.now_playing_label.setText("Now Playing: –")
+        self._set_label(self.now_playing_label, "Now Playing: –")
         self._clear_metadata()
-        self.state_label.setText(f"State: Idle (library: {folder})")
-        self.state_label.setStyleSheet("color: gray;")
-        self.bitperfect_label.setText("Bit-perfect: Unknown")
-        self.bitperfect_label.setStyleSheet("color: #f97316;")
+        self._set_label(self.bitperfect_label, "Bit-perfect: Unknown", _STYLE_WARN)
+        self._last_status_sig = None
 
     def on_rescan(self):
-        try:
-            self.engine._scan_library()
-        except Exception:
-            pass
+        self._start_scan()
+
+    def _start_scan(self, music_dir: Optional[str] = None):
+        if self._rescan_worker is not None:
+            return
+        worker = RescanWorker(self.engine, music_dir)
+        worker.signals.finished.connect(self._on_rescan_finished)
+        worker.signals.error.connect(self._on_rescan_error)
+        self._rescan_worker = worker
+
+        self.rescan_action.setEnabled(False)
+        self._set_label(
+            self.state_label,
+            "State: Scanning library…" if music_dir else "State: Rescanning…",
+            _STYLE_MUTED,
+        )
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        QThreadPool.globalInstance().start(worker)
+
+    def _end_rescan(self):
+        self._rescan_worker = None
+        QApplication.restoreOverrideCursor()
+        self.rescan_action.setEnabled(True)
         self._load_tracks_tree()
-        QMessageBox.information(self, "Rescan", "Library rescan complete.")
+        # the state label still says "Rescanning…"; repaint it on the next poll
+        self._last_status_sig = None
+
+    def _on_rescan_finished(self, count: int):
+        music_dir = self._rescan_worker.music_dir if self._rescan_worker else None
+        self._end_rescan()
+        if music_dir:
+            self._set_label(self.state_label, f"State: Idle (library: {music_dir})")
+            self._last_status_sig = None
+            return
+        QMessageBox.information(self, "Rescan", f"Library rescan complete ({count} tracks).")
+
+    def _on_rescan_error(self, message: str):
+        self._end_rescan()
+        QMessageBox.warning(self, "Rescan", f"Library rescan failed: {message}")
 
     # ---------------- playback actions ----------------
 
-    def on_tree_double_click(self, item: QTreeWidgetItem, col: int):
-        data = item.data(0, Qt.ItemDataRole.UserRole)
-        if not data:
-            return
-        if data.get("type") == "file":
-            track_id = data.get("track_id")
-            if track_id is not None:
-                self.play_track(track_id)
+    def on_tree_double_click(self, index: QModelIndex):
+        data = index.data(Qt.ItemDataRole.UserRole)
+        if isinstance(data, int) and data >= 0:
+            self.play_track(data)
+
+    def _on_tree_selection_changed(self, current: QModelIndex, previous: QModelIndex):
+        data = current.data(Qt.ItemDataRole.UserRole) if current.isValid() else None
+        self._selected_track_id = data if isinstance(data, int) and data >= 0 else None
 
     def on_play_clicked(self):
-        sel = self.tree.currentItem()
-        if not sel:
-            st = self.engine.status()
-            if st.get("current_track_id") is not None and st.get("state") == PlaybackState.PAUSED:
-                self.engine.resume()
+        tid = self._selected_track_id
+        if tid is None:
+            if self.tree.currentIndex().isValid():
+                QMessageBox.information(self, "Select a file", "Please select a song (not a folder).")
+                return
+            engine = self.engine
+            if engine.state == PlaybackState.PAUSED and engine.current_track is not None:
+                engine.resume()
                 return
             QMessageBox.information(self, "No selection", "Select a track to play.")
             return
-        data = sel.data(0, Qt.ItemDataRole.UserRole)
-        if not data or data.get("type") != "file":
-            QMessageBox.information(self, "Select a file", "Please select a song (not a folder).")
-            return
-        tid = data.get("track_id")
         self.play_track(tid)
 
     def on_pause_clicked(self):
@@ -398,13 +916,16 @@ class MainWindow(QMainWindow):
         self.engine.stop()
 
     def on_device_changed(self, idx: int):
+        self._device_timer.start()
+
+    def _apply_device_change(self):
         dev_id = self.device_combo.currentData()
-        if dev_id:
+        # set_output_device persists the config; skip it when nothing changed
+        if dev_id and dev_id != getattr(self.engine, "alsa_card", None):
             self.engine.set_output_device(dev_id)
-            self.state_label.setText(f"State: Idle (output: {dev_id})")
-            self.state_label.setStyleSheet("color: gray;")
-            self.bitperfect_label.setText("Bit-perfect: Unknown")
-            self.bitperfect_label.setStyleSheet("color: #f97316;")
+            self._set_label(self.state_label, f"State: Idle (output: {dev_id})", _STYLE_MUTED)
+            self._set_label(self.bitperfect_label, "Bit-perfect: Unknown", _STYLE_WARN)
+            self._last_status_sig = None
 
     def play_track(self, track_id: int):
         try:
@@ -415,28 +936,20 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Playback error", str(e))
 
     def _current_track_index(self) -> Optional[int]:
-        st = self.engine.status()
-        cur_id = st.get("current_track_id")
-        if cur_id is None:
+        track = self.engine.current_track
+        if track is None:
             return None
-        tracks = self.engine.list_tracks()
-        for i, t in enumerate(tracks):
-            if t.id == cur_id:
-                return i
-        return None
+        return self._track_index.get(track.path)
 
     def on_prev_clicked(self):
-        tracks = self.engine.list_tracks()
+        tracks = self._tracks
         if not tracks:
             return
         cur_idx = self._current_track_index()
         if cur_idx is None:
-            sel = self.tree.currentItem()
-            if sel:
-                data = sel.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get("type") == "file":
-                    self.play_track(data.get("track_id"))
-                    return
+            if self._selected_track_id is not None:
+                self.play_track(self._selected_track_id)
+                return
             self.play_track(tracks[0].id)
             return
 
@@ -444,17 +957,14 @@ class MainWindow(QMainWindow):
         self.play_track(tracks[prev_idx].id)
 
     def on_next_clicked(self):
-        tracks = self.engine.list_tracks()
+        tracks = self._tracks
         if not tracks:
             return
         cur_idx = self._current_track_index()
         if cur_idx is None:
-            sel = self.tree.currentItem()
-            if sel:
-                data = sel.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get("type") == "file":
-                    self.play_track(data.get("track_id"))
-                    return
+            if self._selected_track_id is not None:
+                self.play_track(self._selected_track_id)
+                return
             self.play_track(tracks[0].id)
             return
 
@@ -465,163 +975,248 @@ class MainWindow(QMainWindow):
 
     def on_seek_pressed(self):
         self._seeking = True
+        self._drag_duration = self.engine.get_duration()
 
     def on_seek_moved(self, value: int):
-        s = self.engine.get_duration()
+        s = self._drag_duration
         if s and s > 0:
-            frac = value / 1000.0
-            preview = frac * s
+            preview = value * s * 0.001
             self._seek_preview_seconds = preview
-            self.time_label_current.setText(format_seconds(preview))
+            self._set_label(self.time_label_current, format_seconds(preview))
         else:
-            self.time_label_current.setText("–")
+            self._set_label(self.time_label_current, "–")
 
     def on_seek_released(self):
         value = self.seek_slider.value()
-        s = self.engine.get_duration()
+        s = self._drag_duration
         if s and s > 0:
-            frac = value / 1000.0
-            target = frac * s
+            target = value * s * 0.001
             self.engine.seek(target)
-            self.time_label_current.setText(format_seconds(target))
+            self._set_label(self.time_label_current, format_seconds(target))
         self._seeking = False
         self._seek_preview_seconds = None
+        self._drag_duration = 0.0
 
     def on_slider_clicked(self, slider_value: int):
         s = self.engine.get_duration()
         if s and s > 0:
-            frac = slider_value / 1000.0
-            target = frac * s
+            target = slider_value * s * 0.001
             self.engine.seek(target)
-            self.time_label_current.setText(format_seconds(target))
+            self._set_label(self.time_label_current, format_seconds(target))
             self.seek_slider.setValue(slider_value)
 
     # ---------------- visualizer ----------------
 
     def on_visualizer_clicked(self):
-        if VisualizerWindow is None:
+        # Imported on first use so the main window doesn't pay for it at startup
+        try:
+            from visualizer_window import VisualizerWindow
+        except ImportError:
             QMessageBox.warning(self, "Visualizer", "visualizer_window.py not found.")
             return
 
         try:
             if self.visualizer is None:
                 self.visualizer = VisualizerWindow(engine=self.engine)
-                self.engine.pcm_chunk.connect(self.visualizer.push_chunk)
+                self._pcm_timer.setInterval(int(1000 / self.visualizer.fps))
+                self.engine.pcm_chunk.connect(self._pcm_ring.append, Qt.ConnectionType.DirectConnection)
+            self._pcm_ring.clear()
+            self._pcm_timer.start()
             self.visualizer.show()
             self.visualizer.raise_()
         except Exception as e:
             QMessageBox.warning(self, "Visualizer error", f"Could not open visualizer: {e}")
 
+    def _feed_visualizer(self):
+        ring = self._pcm_ring
+        vis = self.visualizer
+        if vis is None or not vis.isVisible():
+            ring.clear()
+            self._pcm_timer.stop()
+            return
+        chunks = []
+        while ring:
+            chunks.append(ring.popleft())
+        if not chunks:
+            return
+        if len(chunks) == 1:
+            vis.push_chunk(chunks[0])
+            return
+        # One FFT for everything that arrived since the last frame. The
+        # visualizer only reads the first channel of the newest fft_size
+        # frames, so only that part is copied; older chunks of another
+        # sample format (track change mid-batch) are dropped.
+        need = vis.fft_size
+        dtype = chunks[-1].dtype
+        parts = []
+        for c in reversed(chunks):
+            if need <= 0 or c.dtype != dtype:
+                break
+            mono = c[-need:, 0] if c.ndim > 1 else c[-need:]
+            parts.append(mono)
+            need -= len(mono)
+        parts.reverse()
+        vis.push_chunk(np.concatenate(parts))
+
     # ---------------- status / metadata ----------------
 
+    def _set_label(self, label: QLabel, text: str, style: Optional[str] = None):
+        # Only touch the label when its text or style actually changes;
+        # every setText relayouts and every setStyleSheet re-parses CSS.
+        last_text, last_style = self._last_status.get(label, (None, None))
+        if text != last_text:
+            label.setText(text)
+        if style is None:
+            style = last_style
+        elif style != last_style:
+            label.setStyleSheet(style)
+        self._last_status[label] = (text, style)
+
     def _clear_metadata(self):
-        self.art_label.setPixmap(QPixmap())
-        self.meta_title.setText("Title: –")
-        self.meta_artist.setText("Artist: –")
-        self.meta_album.setText("Album: –")
-        self.meta_info.setText("Format: –")
-        self.time_label_current.setText("0:00")
-        self.time_label_total.setText("0:00")
+        self._prev_track = None
+        if self._art_key is not None:
+            self._art_key = None
+            self.art_label.clear()
+        self._set_label(self.meta_title, "Title: –")
+        self._set_label(self.meta_artist, "Artist: –")
+        self._set_label(self.meta_album, "Album: –")
+        self._set_label(self.meta_info, "Format: –")
+        self._set_label(self.time_label_current, "0:00")
+        self._set_label(self.time_label_total, "0:00")
         self.seek_slider.setValue(0)
 
+    def _set_album_art(self, track):
+        if not track.album_art:
+            self._art_key = None
+            self.art_label.clear()
+            return
+
+        # Hashing is far cheaper than decoding, so tracks sharing an album's
+        # cover are a plain cache lookup, even the first time they play
+        digest = art_digest(track.album_art)
+        self._art_key = digest
+        pix = self.art_cache.find(digest)
+        if pix is not None:
+            self.art_label.setPixmap(pix)
+            return
+
+        # Smooth-scaled (or read from the disk cache) on the thread pool;
+        # _on_art_ready swaps it in. Until then show a fast-scaled preview,
+        # unless the disk cache will answer almost immediately anyway.
+        preview = QPixmap()
+        if not self.art_cache.on_disk(digest) and preview.loadFromData(track.album_art):
+            self.art_label.setPixmap(
+                preview.scaled(
+                    ART_SIZE,
+                    ART_SIZE,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.FastTransformation,
+                )
+            )
+        else:
+            self.art_label.clear()
+        self.art_cache.request(digest, track.album_art)
+
+    def _on_art_ready(self, digest: str, pix: QPixmap):
+        if digest == self._art_key:
+            self.art_label.setPixmap(pix)
+
     def update_status(self):
-        s = self.engine.status()
-        state = s.get("state")
-        cur_name = s.get("current_track")
+        engine = self.engine
+        state = engine.state
+        track = engine.current_track
+        tid = track.id if track else None
+
+        # Poll quickly, and move the slider, only while the position is moving
+        playing = state == PlaybackState.PLAYING
+        interval = STATUS_POLL_PLAYING_MS if playing else STATUS_POLL_IDLE_MS
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
+        if playing != self._pos_timer.isActive():
+            if playing:
+                self._pos_timer.start()
+            else:
+                self._pos_timer.stop()
+
+        bitperfect = engine.bitperfect
+        reason = engine.bitperfect_reason
+
+        sig = (track, state, bitperfect, reason)
+        if sig == self._last_status_sig:
+            if track is not None:
+                self._update_position()
+            return
+        self._last_status_sig = sig
 
         # Now playing / state
-        if cur_name:
-            self.now_playing_label.setText(f"Now Playing: {cur_name}")
+        if track:
+            self._set_label(self.now_playing_label, f"Now Playing: {track.name}")
         else:
-            self.now_playing_label.setText("Now Playing: –")
-
-        if state == PlaybackState.PLAYING:
-            self.state_label.setText("State: Playing")
-            self.state_label.setStyleSheet("color: #22c55e;")
-        elif state == PlaybackState.PAUSED:
-            self.state_label.setText("State: Paused")
-            self.state_label.setStyleSheet("color: #facc15;")
-        elif state == PlaybackState.STOPPED:
-            self.state_label.setText("State: Stopped")
-            self.state_label.setStyleSheet("color: gray;")
-        else:
-            if "output:" not in self.state_label.text():
-                self.state_label.setText("State: Idle")
-            self.state_label.setStyleSheet("color: gray;")
+            self._set_label(self.now_playing_label, "Now Playing: –")
+
+        # While a scan runs, keep "Scanning library…" / "Rescanning…" up;
+        # _end_rescan() resets the signature so the state is painted after
+        if self._rescan_worker is None:
+            if state == PlaybackState.PLAYING:
+                self._set_label(self.state_label, "State: Playing", _STYLE_OK)
+            elif state == PlaybackState.PAUSED:
+                self._set_label(self.state_label, "State: Paused", _STYLE_PAUSED)
+            elif state == PlaybackState.STOPPED:
+                self._set_label(self.state_label, "State: Stopped", _STYLE_MUTED)
+            else:
+                idle_text = self.state_label.text()
+                if "output:" not in idle_text:
+                    idle_text = "State: Idle"
+                self._set_label(self.state_label, idle_text, _STYLE_MUTED)
 
         # Bit-perfect indicator
-        bitperfect = s.get("bitperfect", False)
-        reason = s.get("bitperfect_reason", "")
-
         if bitperfect:
-            self.bitperfect_label.setText("Bit-perfect: YES")
-            self.bitperfect_label.setStyleSheet("color: #22c55e;")
+            self._set_label(self.bitperfect_label, "Bit-perfect: YES", _STYLE_OK)
         else:
-            if state in (PlaybackState.IDLE, None) and not s.get("current_track_id"):
-                self.bitperfect_label.setText("Bit-perfect: Unknown")
-                self.bitperfect_label.setStyleSheet("color: #f97316;")
+            if state in (PlaybackState.IDLE, None) and not tid:
+                self._set_label(self.bitperfect_label, "Bit-perfect: Unknown", _STYLE_WARN)
             else:
-                if reason:
-                    self.bitperfect_label.setText(f"Bit-perfect: NO ({reason})")
-                else:
-                    self.bitperfect_label.setText("Bit-perfect: NO")
-                self.bitperfect_label.setStyleSheet("color: #f97316;")
+                text = f"Bit-perfect: NO ({reason})" if reason else "Bit-perfect: NO"
+                self._set_label(self.bitperfect_label, text, _STYLE_WARN)
 
         # Metadata / time / slider
-        tid = s.get("current_track_id")
-        if tid is None:
+        if track is None:
             self._clear_metadata()
             return
 
-        track = self.engine.get_track_by_id(tid)
-        if not track:
-            return
+        # Track metadata only changes with the track itself
+        if track is not self._prev_track:
+            self._prev_track = track
+            self._set_label(self.meta_title, f"Title: {track.title or '–'}")
+            self._set_label(self.meta_artist, f"Artist: {track.artist or '–'}")
+            self._set_label(self.meta_album, f"Album: {track.album or '–'}")
 
-        self.meta_title.setText(f"Title: {track.title or '–'}")
-        self.meta_artist.setText(f"Artist: {track.artist or '–'}")
-        self.meta_album.setText(f"Album: {track.album or '–'}")
+            if track.sample_rate and track.bit_depth and track.channels:
+                fmt = f"{track.sample_rate/1000:.1f} kHz | {track.bit_depth}-bit | {track.channels} ch"
+            else:
+                fmt = "–"
+            self._set_label(self.meta_info, f"Format: {fmt}")
 
-        if track.sample_rate and track.bit_depth and track.channels:
-            fmt = f"{track.sample_rate/1000:.1f} kHz | {track.bit_depth}-bit | {track.channels} ch"
-        else:
-            fmt = "–"
-        self.meta_info.setText(f"Format: {fmt}")
+            self._set_album_art(track)
 
-        if track.album_art:
-            try:
-                img = QImage.fromData(track.album_art)
-                pix = QPixmap.fromImage(img).scaled(
-                    200,
-                    200,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                self.art_label.setPixmap(pix)
-            except Exception:
-                self.art_label.setPixmap(QPixmap())
-        else:
-            self.art_label.setPixmap(QPixmap())
+        self._update_position()
 
-        pos = s.get("position", 0.0)
-        dur = s.get("duration", 0.0) or 0.0
+    def _update_position(self):
+        engine = self.engine
+        pos = engine.get_position()
+        dur = engine.get_duration()
 
-        self.time_label_total.setText(format_seconds(dur))
+        self._set_label(self.time_label_total, format_seconds(dur))
 
         if self._seeking:
             return
 
-        try:
-            if dur > 0:
-                frac = max(0.0, min(1.0, pos / dur))
-            else:
-                frac = 0.0
-            slider_val = int(round(frac * 1000.0))
+        slider_val = min(1000, max(0, int(pos * 1000.0 / dur))) if dur > 0 else 0
+        if self.seek_slider.value() != slider_val:
             self.seek_slider.blockSignals(True)
             self.seek_slider.setValue(slider_val)
             self.seek_slider.blockSignals(False)
-            self.time_label_current.setText(format_seconds(pos))
-        except Exception:
-            pass
+        self._set_label(self.time_label_current, format_seconds(pos))
 
     # ---------------- close ----------------
 
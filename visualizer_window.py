@@ -2,7 +2,8 @@
 # Audiophile FFT visualizer: log-frequency FFT, dB scale, A-weighting option,
 # smoothing (EMA), peak-hold, octave / reference markers.
 #
-# Dependencies: PyQt6, numpy
+# Dependencies: PyQt6, numpy (scipy optional: faster float32 FFT;
+#               numba optional: fused band / peak-hold kernel)
 #
 # Usage: create VisualizerWindow(engine) or VisualizerWindow() and connect:
 #   engine.pcm_chunk.connect(visualizer.push_chunk)
@@ -11,12 +12,30 @@
 # if available; otherwise it falls back to 44100 Hz.
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSlider
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QTimer, Qt, QRect, QLine
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont
 import numpy as np
 import math
 import time
 
+# scipy's pocketfft keeps float32 input in single precision (numpy does too
+# since 2.0, older numpy computes in float64); numpy's rfft can instead write
+# into a preallocated output array
+try:
+    from scipy.fft import rfft as _rfft
+
+    _RFFT_KWARGS = {"overwrite_x": True}
+    _RFFT_OUT = False
+except ImportError:
+    _rfft = np.fft.rfft
+    _RFFT_KWARGS = {}
+    _RFFT_OUT = True
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def a_weighting(freq_hz: np.ndarray) -> np.ndarray:
     # A-weighting according to IEC 61672 (approx)
@@ -30,7 +49,42 @@ def a_weighting(freq_hz: np.ndarray) -> np.ndarray:
     return a
 
 
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _update_bands(power, starts, ends, nearest, aw_gain_db, a_weight, floor, db_offset, alpha,
+                      smoothed, latest_db, peak_values, peak_times, hold, now):
+        # one pass per band: mean power -> dB (+ A-weighting) -> EMA -> peak hold.
+        # Same results as the numpy path in VisualizerWindow._compute_fft().
+        for b in range(smoothed.shape[0]):
+            s = starts[b]
+            e = ends[b]
+            if e > s:
+                acc = 0.0
+                for i in range(s, e):
+                    acc += power[i]
+                p = acc / (e - s)
+            else:
+                p = power[nearest[b]]
+            db = 10.0 * math.log10(max(p, floor)) + db_offset
+            if a_weight:
+                db += aw_gain_db[b]
+            latest_db[b] = db
+            sm = (1.0 - alpha) * smoothed[b] + alpha * latest_db[b]
+            smoothed[b] = sm
+            if sm > peak_values[b]:
+                peak_values[b] = sm
+                peak_times[b] = now
+            elif now - peak_times[b] > hold:
+                peak_values[b] = max(sm, peak_values[b] - 0.6)
+else:
+    _update_bands = None
+
+
 class VisualizerWindow(QWidget):
+    # plotted dB range (top of the plot .. bottom of the plot)
+    TOP_DB = 12.0
+    BOTTOM_DB = -100.0
+
     def __init__(
         self,
         engine=None,
@@ -53,8 +107,19 @@ class VisualizerWindow(QWidget):
         # FFT / buffer parameters
         self.fft_size = int(fft_size)
         self.hop_size = max(256, int(self.fft_size // 8))
-        self.buffer = np.zeros(self.fft_size, dtype=np.float32)
+        # mirrored ring buffer: every sample is stored at i and i + fft_size,
+        # so the newest fft_size samples are always the contiguous slice
+        # _ring[_wpos:_wpos + fft_size] (oldest first), without shifting
+        self._ring = np.zeros(2 * self.fft_size, dtype=np.float32)
+        self._wpos = 0
         self.buffer_fill = 0
+        # new samples since the last spectrum; the frame timer runs at most
+        # one FFT per displayed frame, however many chunks arrive in between
+        self._dirty = False
+        # 1 / full scale per integer sample dtype, for normalizing to [-1, 1]
+        self._int_scales = {}
+        # converted samples of non-float32-mono chunks
+        self._chunk_buf = np.empty(self.fft_size, dtype=np.float32)
 
         # display settings
         self.bands = bands
@@ -62,7 +127,7 @@ class VisualizerWindow(QWidget):
         self.max_freq = float(max_freq)
         self.smoothing = float(smoothing)
         self.peak_hold_seconds = float(peak_hold_seconds)
-        self.peak_times = np.zeros(self.bands, dtype=np.float64)
+        self.peak_times = np.zeros(self.bands, dtype=np.float32)  # seconds since _t0
         self.peak_values = np.full(self.bands, -200.0, dtype=np.float32)
 
         # data arrays
@@ -72,6 +137,12 @@ class VisualizerWindow(QWidget):
         # A-weight toggle
         self.a_weight = False
 
+        # per-FFT lookup tables (window, bin frequencies, bin -> band map),
+        # rebuilt by _ensure_tables() when their inputs change
+        self._tables_key = None
+        # per-size paint geometry (band x pixels), rebuilt by _ensure_layout()
+        self._layout_key = None
+
         # UI controls
         layout = QVBoxLayout(self)
         ctrl_row = QHBoxLayout()
@@ -106,11 +177,12 @@ class VisualizerWindow(QWidget):
         info.setStyleSheet("color: gray;")
         layout.addWidget(info)
 
-        # repaint timer
+        # frame timer (spectrum + repaint); only runs while the window is
+        # shown (showEvent / hideEvent)
         self.fps = fps
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(int(1000 / self.fps))
+        self.timer.setInterval(int(1000 / self.fps))
+        self.timer.timeout.connect(self._on_frame)
 
         # visual style
         self.bg = QColor(8, 8, 10)
@@ -120,16 +192,19 @@ class VisualizerWindow(QWidget):
         self.text_color = QColor(200, 200, 200)
         self.font = QFont("Monospace", 9)
 
-        # time tracking for peak hold decay
-        self._now = time.time()
+        # time tracking for peak hold decay: monotonic seconds relative to
+        # window creation, small enough to keep in float32
+        self._t0 = time.monotonic()
 
     # ----- control callbacks -----
     def _toggle_a_weight(self, checked):
         self.a_weight = checked
         self.aw_btn.setText("A-weight: ON" if checked else "A-weight: OFF")
+        self.update()
 
     def _smooth_changed(self, v):
         self.smoothing = v / 100.0
+        self.update()
 
     def _peak_changed(self, v):
         self.peak_hold_seconds = v / 100.0
@@ -137,46 +212,82 @@ class VisualizerWindow(QWidget):
     def _clear_peaks(self):
         self.peak_values.fill(-200.0)
         self.peak_times.fill(0.0)
+        self.update()
+
+    # ----- visibility -----
+    def showEvent(self, ev):
+        super().showEvent(ev)
+        self.timer.start()
+
+    def hideEvent(self, ev):
+        super().hideEvent(ev)
+        self.timer.stop()
+
+    def _is_shown(self):
+        # hidden, minimized or fully covered: nothing would be painted
+        return self.isVisible() and not self.isMinimized() and not self.visibleRegion().isEmpty()
 
     # ----- audio input -----
     def push_chunk(self, pcm):
         """
         Called from engine.pcm_chunk via Qt signal. Accepts array (frames,channels) or (frames,).
-        We append left channel (or mono) to a rolling buffer and run FFT when full enough.
+        We append left channel (or mono) to a rolling buffer; the next frame tick runs the FFT.
         """
         try:
-            arr = np.array(pcm, copy=False)
-            if arr.ndim > 1:
-                arr = arr[:, 0]
-            # normalize integer types
-            if np.issubdtype(arr.dtype, np.integer):
-                info = np.iinfo(arr.dtype)
-                arr = arr.astype(np.float32) / float(info.max)
+            if isinstance(pcm, np.ndarray) and pcm.dtype == np.float32 and pcm.ndim == 1:
+                # already float32 mono: used as is
+                arr = pcm
             else:
-                arr = arr.astype(np.float32)
-
-            # append to circular buffer (simple rolling)
+                src = np.asarray(pcm)
+                if src.ndim > 1:
+                    src = src[:, 0]
+                # only the newest fft_size samples can end up in the ring; they
+                # are read straight from the (strided) channel view and
+                # converted into the contiguous float32 scratch in one pass
+                src = src[-self.fft_size:]
+                arr = self._chunk_buf[:src.size]
+                # normalize integer types
+                if src.dtype.kind in "iu":
+                    scale = self._int_scales.get(src.dtype)
+                    if scale is None:
+                        scale = self._int_scales[src.dtype] = 1.0 / float(np.iinfo(src.dtype).max)
+                    np.multiply(src, scale, out=arr, casting="unsafe")
+                else:
+                    np.copyto(arr, src, casting="unsafe")
+
+            # append to ring buffer
             n = arr.size
             if n == 0:
                 return
-            if n >= self.fft_size:
+            size = self.fft_size
+            if n > size:
                 # if chunk bigger than fft, use last fft_size samples
-                new = arr[-self.fft_size:]
-                self.buffer[:] = new
-                self.buffer_fill = self.fft_size
-            else:
-                # roll left and append
-                shift = n
-                self.buffer = np.roll(self.buffer, -shift)
-                self.buffer[-n:] = arr
-                self.buffer_fill = min(self.fft_size, self.buffer_fill + n)
+                arr = arr[-size:]
+                n = size
+            ring = self._ring
+            w = self._wpos
+            first = min(n, size - w)
+            ring[w:w + first] = arr[:first]
+            ring[w + size:w + size + first] = arr[:first]
+            rest = n - first
+            if rest:
+                ring[:rest] = arr[first:]
+                ring[size:size + rest] = arr[first:]
+            self._wpos = (w + n) % size
+            self.buffer_fill = min(size, self.buffer_fill + n)
+            self._dirty = True
         except Exception as e:
             # do not let exceptions cross Qt boundary
             print("Visualizer push_chunk error:", e)
 
-        # If buffer has enough samples, compute FFT and update display arrays
-        if self.buffer_fill >= self.fft_size:
-            self._compute_fft()
+    def _on_frame(self):
+        # once the buffer is full, compute one spectrum from the newest
+        # samples and repaint; nothing changes on screen without new audio
+        if not self._dirty or self.buffer_fill < self.fft_size:
+            return
+        self._dirty = False
+        self._compute_fft()
+        self.update()
 
     # ----- FFT and mapping -----
     def _get_samplerate(self):
@@ -190,68 +301,137 @@ class VisualizerWindow(QWidget):
             pass
         return 44100
 
+    def _ensure_tables(self, sr):
+        key = (sr, self.fft_size, self.bands, self.min_freq, self.max_freq)
+        if key == self._tables_key:
+            return
+        self._tables_key = key
+
+        # Hann window (np.hanning), computed in place in float32
+        win = np.arange(self.fft_size, dtype=np.float32)
+        win *= np.float32(2.0 * math.pi / (self.fft_size - 1))
+        np.cos(win, out=win)
+        win *= -0.5
+        win += 0.5
+        self._win = win
+        self._fft_in = np.empty(self.fft_size, dtype=np.float32)
+        freqs = np.fft.rfftfreq(self.fft_size, d=1.0 / sr)
+        self._freqs = freqs
+        self._spec = np.empty(len(freqs), dtype=np.complex64)
+        self._power = np.empty(len(freqs), dtype=np.float32)
+        self._power_im = np.empty(len(freqs), dtype=np.float32)
+
+        # amplitude normalization by fft_size / 2, applied as a dB offset after
+        # band averaging; the floor keeps the old -120 dB limit on normalized power
+        half = self.fft_size / 2.0
+        self._db_offset = -20.0 * math.log10(half)
+        self._power_floor = 1e-12 * half * half
+
+        # band i covers bins starts[i]:ends[i], i.e. log_bins[i] <= f < log_bins[i + 1];
+        # freqs is sorted, so the bands are consecutive runs of bins
+        fmin = max(0.1, float(self.min_freq))
+        log_bins = np.logspace(math.log10(fmin), math.log10(float(self.max_freq)), num=self.bands + 1)
+        starts = np.searchsorted(freqs, log_bins[:-1], side="left")
+        ends = np.searchsorted(freqs, log_bins[1:], side="left")
+        self._band_start = starts
+        self._band_end = ends
+        self._band_count = ends - starts
+        self._band_div = np.maximum(self._band_count, 1).astype(np.float32)
+
+        # np.add.reduceat offsets: bands starting below Nyquist, plus the
+        # end of the last of them unless it runs to the end of the spectrum
+        n = len(freqs)
+        k = int(np.searchsorted(starts, n))
+        idx = starts[:k]
+        if k and ends[k - 1] < n:
+            idx = np.append(idx, ends[k - 1])
+        self._reduce_idx = idx
+        self._reduce_bands = k
+        self._reduce_out = np.empty(len(idx), dtype=np.float32)
+
+        # bands no bin falls into use the bin nearest to the band center
+        centers = (log_bins[:-1] + log_bins[1:]) / 2.0
+        self._band_nearest = np.abs(freqs[None, :] - centers[:, None]).argmin(axis=1)
+        self._band_empty = np.flatnonzero(self._band_count == 0)
+        self._band_empty_src = self._band_nearest[self._band_empty]
+
+        # per-band scratch for the numpy path (the numba kernel needs none)
+        self._band_tmp = np.empty(self.bands, dtype=np.float32)
+        self._band_rising = np.empty(self.bands, dtype=bool)
+        self._band_decay = np.empty(self.bands, dtype=bool)
+
+        # A-weighting gain (dB) at each band's geometric center
+        self._aw_gain_db = a_weighting(np.sqrt(log_bins[:-1] * log_bins[1:])).astype(np.float32)
+
     def _compute_fft(self):
+        if not self._is_shown():
+            return
         sr = self._get_samplerate()
+        self._ensure_tables(sr)
         # windowed FFT
-        win = np.hanning(self.fft_size).astype(np.float32)
-        data = self.buffer * win
-        spec = np.fft.rfft(data)
-        mag = np.abs(spec) / (self.fft_size / 2.0)   # amplitude normalization
-        # avoid log of zero
-        mag = np.maximum(mag, 1e-12)
-        freqs = np.fft.rfftfreq(self.fft_size, d=1.0 / sr)
+        window = self._ring[self._wpos:self._wpos + self.fft_size]
+        data = np.multiply(window, self._win, out=self._fft_in)
+        if _RFFT_OUT:
+            spec = _rfft(data, out=self._spec)
+        else:
+            spec = _rfft(data, **_RFFT_KWARGS)
+        # squared magnitude, unnormalized; staying in the power domain until after band averaging means only `bands` logs
+        power = np.square(spec.real, out=self._power)
+        np.add(power, np.square(spec.imag, out=self._power_im), out=power)
+        alpha = 1.0 - self.smoothing  # we want smoothing near 1 to be slow; alpha is update rate
 
-        # Convert to dB
-        db = 20.0 * np.log10(mag)
+        if _update_bands is not None:
+            _update_bands(
+                power, self._band_start, self._band_end, self._band_nearest,
+                self._aw_gain_db, self.a_weight, self._power_floor, self._db_offset, alpha,
+                self.smoothed, self.latest_db, self.peak_values, self.peak_times,
+                self.peak_hold_seconds, time.monotonic() - self._t0,
+            )
+            return
+
+        # Map to log-frequency bands, then convert to dB (avoid log of zero);
+        # all in place in latest_db
+        band_db = self._map_to_log_bands(power, out=self.latest_db)
+        np.maximum(band_db, self._power_floor, out=band_db)
+        np.log10(band_db, out=band_db)
+        band_db *= 10.0
+        band_db += self._db_offset
 
         # apply A-weighting if requested
         if self.a_weight:
-            db = db + a_weighting(freqs)
-
-        # Map to log-frequency bands
-        band_db = self._map_to_log_bands(freqs, db, self.bands, self.min_freq, self.max_freq)
+            band_db += self._aw_gain_db
 
         # smoothing (EMA)
-        alpha = 1.0 - self.smoothing  # we want smoothing near 1 to be slow; alpha is update rate
-        self.smoothed = (1.0 - alpha) * self.smoothed + alpha * band_db
-        self.latest_db = band_db
+        tmp = self._band_tmp
+        smoothed = self.smoothed
+        smoothed *= 1.0 - alpha
+        smoothed += np.multiply(band_db, alpha, out=tmp)
 
         # update peaks (peak hold)
-        now = time.time()
-        for i in range(self.bands):
-            v = self.smoothed[i]
-            if v > self.peak_values[i]:
-                self.peak_values[i] = v
-                self.peak_times[i] = now
-            else:
-                # decay after hold time
-                if (now - self.peak_times[i]) > self.peak_hold_seconds:
-                    # decay peak slowly towards smoothed value
-                    self.peak_values[i] = max(self.smoothed[i], self.peak_values[i] - 0.6)
-
-    def _map_to_log_bands(self, freqs, db, bands, fmin, fmax):
+        now = np.float32(time.monotonic() - self._t0)
+        rising = np.greater(smoothed, self.peak_values, out=self._band_rising)
+        # decay after hold time, slowly towards smoothed value
+        decay = np.greater(np.subtract(now, self.peak_times, out=tmp), self.peak_hold_seconds, out=self._band_decay)
+        decay &= ~rising
+        np.copyto(self.peak_values, smoothed, where=rising)
+        np.copyto(self.peak_times, now, where=rising)
+        np.maximum(smoothed, np.subtract(self.peak_values, 0.6, out=tmp), out=tmp)
+        np.copyto(self.peak_values, tmp, where=decay)
+
+    def _map_to_log_bands(self, power, out=None):
         """
-        Map linear FFT bins to `bands` log-spaced frequency columns between fmin and fmax.
-        We compute weighted average of FFT bins falling into each band (in linear power domain).
+        Map linear FFT bin powers to `bands` log-spaced frequency columns between
+        min_freq and max_freq: the mean power of the bins falling into each band.
+        Uses the bin -> band tables from _ensure_tables(); writes into `out` if given.
         """
-        fmin = max(0.1, float(fmin))
-        fmax = float(fmax)
-        log_bins = np.logspace(math.log10(fmin), math.log10(fmax), num=bands + 1)
-        band_vals = np.full(bands, -200.0, dtype=np.float32)
-
-        power = 10 ** (db / 10.0)  # convert dB to linear power
-        for i in range(bands):
-            low = log_bins[i]
-            high = log_bins[i + 1]
-            # select FFT bins within this band
-            idx = np.where((freqs >= low) & (freqs < high))[0]
-            if idx.size == 0:
-                # if no bin falls in band, pick nearest bin
-                idx = np.array([np.argmin(np.abs(freqs - (low + high) / 2.0))], dtype=int)
-            # average power then convert back to dB
-            pw = np.mean(power[idx])
-            band_vals[i] = 10.0 * np.log10(max(pw, 1e-12))
-        return band_vals
+        k = self._reduce_bands
+        pw = np.empty(self.bands, dtype=np.float32) if out is None else out
+        if k:
+            sums = np.add.reduceat(power, self._reduce_idx, out=self._reduce_out)
+            np.divide(sums[:k], self._band_div[:k], out=pw[:k])
+        # if no bin falls in band, pick nearest bin
+        pw[self._band_empty] = power[self._band_empty_src]
+        return pw
 
     # ----- drawing -----
     def paintEvent(self, ev):
@@ -282,30 +462,22 @@ class VisualizerWindow(QWidget):
             painter.drawText(4, y - 2, f"{db_val} dB")
             painter.setPen(pen)
 
-        # compute x positions for bands (log spaced visually)
-        xs = np.logspace(math.log10(self.min_freq), math.log10(self.max_freq), num=self.bands)
-        # map to x pixel positions (log axis)
-        freqs_log = np.logspace(math.log10(self.min_freq), math.log10(self.max_freq), num=self.bands)
-        x_positions = np.log10(freqs_log / self.min_freq) / math.log10(self.max_freq / self.min_freq)
-        x_pixels = (x_positions * (w - 120)) + 60.0  # leave left/right margins
-
-        # draw bars
-        bar_width = max(1.0, (w - 120) / self.bands * 0.9)
-        for i in range(self.bands):
-            dbv = float(self.smoothed[i])
-            y = self._db_to_y(dbv, plot_y, plot_h)
-            x = x_pixels[i]
-            # bar rect: from y to bottom of plot area
-            painter.setPen(Qt.PenStyle.NoPen)
-            # gradient color based on amplitude
-            painter.setBrush(self.bar_fg)
-            painter.drawRect(int(x), int(y), int(bar_width), int(plot_y + plot_h - y))
-
-            # peak marker
-            pv = float(self.peak_values[i])
-            py = self._db_to_y(pv, plot_y, plot_h)
-            painter.setPen(QPen(self.peak_fg))
-            painter.drawLine(int(x), int(py), int(x + bar_width), int(py))
+        # x positions for bands (log spaced visually)
+        self._ensure_layout(w)
+        bar_left = self._bar_left
+        bar_right = self._bar_right
+        bar_width = self._bar_width
+        ys = self._db_to_ys(self.smoothed, plot_y, plot_h).tolist()
+        pys = self._db_to_ys(self.peak_values, plot_y, plot_h).tolist()
+
+        # draw bars (rect from y to bottom of plot area), then peak markers;
+        # one batched call each
+        bottom = plot_y + plot_h
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.bar_fg)
+        painter.drawRects([QRect(x, y, bar_width, bottom - y) for x, y in zip(bar_left, ys)])
+        painter.setPen(QPen(self.peak_fg))
+        painter.drawLines([QLine(x, py, xr, py) for x, xr, py in zip(bar_left, bar_right, pys)])
 
         # draw frequency labels for octave ticks and reference points
         painter.setPen(self.text_color)
@@ -329,14 +501,35 @@ class VisualizerWindow(QWidget):
 
         painter.end()
 
+    def _ensure_layout(self, w):
+        # band x pixels only depend on the width and the band count, so they
+        # are kept between paints until one of those changes (resize)
+        key = (w, self.bands)
+        if key == self._layout_key:
+            return
+        self._layout_key = key
+
+        # map to x pixel positions (log axis); band centers are log spaced, so
+        # on a log axis they are evenly spaced
+        x_positions = np.linspace(0.0, 1.0, num=self.bands)
+        x_pixels = (x_positions * (w - 120)) + 60.0  # leave left/right margins
+        bar_width = max(1.0, (w - 120) / self.bands * 0.9)
+        self._bar_left = x_pixels.astype(np.int32).tolist()
+        self._bar_right = (x_pixels + bar_width).astype(np.int32).tolist()
+        self._bar_width = int(bar_width)
+
     def _db_to_y(self, db_val, plot_y, plot_h):
         # map dB range [-100 .. +12] to pixel y (higher dB => smaller y)
-        top_db = 12.0
-        bottom_db = -100.0
-        frac = (db_val - top_db) / (bottom_db - top_db)
+        frac = (db_val - self.TOP_DB) / (self.BOTTOM_DB - self.TOP_DB)
         frac = max(0.0, min(1.0, frac))
         return int(plot_y + frac * plot_h)
 
+    def _db_to_ys(self, db_vals, plot_y, plot_h):
+        # _db_to_y for a whole array of dB values
+        frac = (db_vals.astype(np.float64) - self.TOP_DB) / (self.BOTTOM_DB - self.TOP_DB)
+        np.clip(frac, 0.0, 1.0, out=frac)
+        return (plot_y + frac * plot_h).astype(np.int32)
+
     # expose a simple API to set min/max frequency
     def set_frequency_range(self, fmin, fmax):
         self.min_freq = float(max(1.0, fmin))